@@ -387,7 +387,7 @@ class MPSupport(Exception):
 class BatchRunnerMP(BatchRunner):
     """ Child class of BatchRunner, extended with multiprocessing support. """
 
-    def __init__(self, model_cls, nr_processes=None, **kwargs):
+    def __init__(self, model_cls, nr_processes=None, chunksize=1, **kwargs):
         """ Create a new BatchRunnerMP for a given model with the given
         parameters.
 
@@ -395,6 +395,8 @@ class BatchRunnerMP(BatchRunner):
             model_cls: The class of model to batch-run.
             nr_processes: the number of separate processes the BatchRunner
                 should start, all running in parallel.
+            chunksize: how many runs are handed to a worker at a time, so
+                that dispatch overhead does not dominate short runs.
             kwargs: the kwargs required for the parent BatchRunner class
         """
         if nr_processes == None:
@@ -406,6 +408,7 @@ class BatchRunnerMP(BatchRunner):
             self.processes = nr_processes
 
         super().__init__(model_cls, **kwargs)
+        self.chunksize = chunksize
         self.pool = Pool(self.processes)
 
     def run_all(self):
@@ -425,7 +428,7 @@ class BatchRunnerMP(BatchRunner):
                     # make a new process and add it to the queue
             #with self.pool as p:
         if self.processes > 1:
-            for params, model_data in self.pool.imap_unordered(self.run_wrapper, run_iter_args):
+            for params, model_data in self.pool.imap_unordered(self.run_wrapper, run_iter_args, chunksize=self.chunksize):
                 results[str(params)] = model_data
         #For debugging model due to difficulty of getting errors during multiprocessing
         else:
@@ -437,38 +440,18 @@ class BatchRunnerMP(BatchRunner):
 
         return results
 
-        # empty the queue
-
-        '''
-        results = []
-        for task in job_queue:
-            for model_vars, agent_vars in list(task):
-                results.append((model_vars, agent_vars))
-            pbar.update()
-
-        # store the results
-        for model_vars, agent_vars in results:
-            if self.model_reporters:
-                for model_key, model_val in model_vars.items():
-                    self.model_vars[model_key] = model_val
-            if self.agent_reporters:
-                for agent_key, reports in agent_vars.items():
-                    self.agent_vars[agent_key] = reports
-
-        
-        with tqdm(total_iterations, disable=not self.display_progress) as pbar:
-            for i, kwargs in enumerate(all_kwargs):
-                param_values = all_param_values[i]
-                for _ in range(self.iterations):
-                    # make a list of parameters for each model run
-                    job_queue.append((kwargs, param_values, next(run_count)))
-                    #start dictionary to store results
-                    #results[next(run_count)] =[param_values]
-
-            # empty the queue
-            results = []
-            print (len(job_queue))
-            with self.pool as p:
-                results.append(p.imap_unordered(self.run_iteration, job_queue))
-                pbar.update()   
-        '''
\ No newline at end of file
+    def run_iter(self):
+        """
+        Run the model at all parameter combinations, yielding each run's
+        (params, model_data) pair as it completes. Callers can stream
+        results to disk instead of holding the whole ensemble in memory.
+        """
+        run_iter_args, total_iterations = self._make_model_args()
+
+        if self.processes > 1:
+            for params, model_data in self.pool.imap_unordered(self.run_wrapper, run_iter_args, chunksize=self.chunksize):
+                yield params, model_data
+        #For debugging model due to difficulty of getting errors during multiprocessing
+        else:
+            for run in run_iter_args:
+                yield self.run_wrapper(run)
\ No newline at end of file
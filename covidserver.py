@@ -13,45 +13,29 @@ from mesa.visualization.UserParam import UserSettableParameter
 from isepi import ISEpiModel
 from isepi import Stage
 from isepi import MobilityType
+import logging
 
-def agent_portrayal(agent):
-    portrayal = {"Shape": "circle",
-                 "Filled": "true",
-                 "Layer": 0,
-                 "r": 0.5}
+logging.basicConfig(level=logging.INFO)
+
+# Stage-to-color table, looked up once per agent instead of walking an
+# if/elif chain of enum comparisons on every frame
+_STAGE_COLORS = {
+    Stage.SUSCEPTIBLE: "blue",
+    Stage.INFECTED: "red",
+    Stage.RECOVERED: "green",
+    Stage.DECEASED: "black"
+}
 
-    if agent.stage == Stage.SUSCEPTIBLE:
-        portrayal["Color"] = "blue"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.EXPOSED:
-        portrayal["Color"] = "red"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.ASYMPTOMATIC:
-        portrayal["Color"] = "brown"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.SYMPDETECTED:
-        portrayal["Color"] = "yellow"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.ASYMPDETECTED:
-        portrayal["Color"] = "cyan"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.SEVERE:
-        portrayal["Color"] = "magenta"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.RECOVERED:
-        portrayal["Color"] = "green"
-        portrayal["Layer"] = 0
-    elif agent.stage == Stage.DECEASED:
-        portrayal["Color"] = "black"
-        portrayal["Layer"] = 0
-    elif agent.locked:
-        portrayal["Color"] = "gray"
-        portrayal["Layer"] = 0
-    else:
-        portrayal["Color"] = "gray"
-        portrayal["Layer"] = 0
+# Only Color varies between agents, so the full portrayal dicts are built
+# once at import; CanvasGrid mutates what it receives, hence the copy()
+_GRAY_PORTRAYAL = {"Shape": "circle", "Filled": "true", "Layer": 0,
+                   "r": 0.5, "Color": "gray"}
+_PORTRAYALS = {stage: {"Shape": "circle", "Filled": "true", "Layer": 0,
+                       "r": 0.5, "Color": color}
+               for stage, color in _STAGE_COLORS.items()}
 
-    return portrayal
+def agent_portrayal(agent):
+    return _PORTRAYALS.get(agent.stage, _GRAY_PORTRAYAL).copy()
 
 grid = CanvasGrid(agent_portrayal, 50, 50, 400, 400)
 
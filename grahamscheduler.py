@@ -22,26 +22,43 @@ class GrahamActivation(BaseScheduler):
             can be divided into ordered classes.
         """
         super().__init__(model)
-        self.stages = {}
+        self.stages = {p: [] for p in range(0, partitions)}
         self.partitions = partitions
 
 
+    def add(self, agent) -> None:
+        """Adds an agent to the schedule and to its earmark bucket."""
+
+        super().add(agent)
+        self.stages[agent.earmark].append(agent)
+
+
+    def remove(self, agent) -> None:
+        """Removes an agent from the schedule and from its earmark bucket."""
+
+        super().remove(agent)
+        self.stages[agent.earmark].remove(agent)
+
+
+    def change_earmark(self, agent, earmark) -> None:
+        """Moves an agent between earmark buckets, keeping them consistent."""
+
+        self.stages[agent.earmark].remove(agent)
+        agent.earmark = earmark
+        self.stages[earmark].append(agent)
+
+
     def step(self) -> None:
         """Executes the step of all agents according to their earmarks, randomly
-        for each earmark.
+        for each earmark. Buckets persist between steps and hold the agents
+        themselves, so dispatch needs no lookup into the agent dict.
         """
 
-        for p in range(0, self.partitions):
-            self.stages[p] = []
-
-        for agent in self._agents.values(): 
-            self.stages[agent.earmark].append(agent.unique_id)
-           
         for earmark in self.stages.keys():
-            self.model.random.shuffle(self.stages[earmark])
+            self.model.rng.shuffle(self.stages[earmark])
 
-            for unique_id in self.stages[earmark]:
-                self._agents[unique_id].step()
+            for agent in self.stages[earmark]:
+                agent.step()
 
         self.steps += 1
         self.time += 1
\ No newline at end of file
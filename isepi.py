@@ -14,17 +14,38 @@ from mesa import Agent, Model
 from mesa.time import RandomActivation
 from mesa.space import MultiGrid
 from datacollection import DataCollector
-from scipy.stats import poisson, bernoulli
 from grahamscheduler import GrahamActivation
-from enum import Enum
+from collections import defaultdict
+from enum import Enum, IntEnum
 import numpy as np
+import logging
 import random
 import sys
 
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+
+        return wrap
+
 
 # Strip down to SIRD (susceptible, infected, recovered, deceased)
 
-class Stage(Enum):
+# IntEnum so that stage comparisons lower to plain int compares under
+# ahead-of-time compilers (mypyc/Cython) as well as in the interpreter
+class Stage(IntEnum):
     SUSCEPTIBLE = 1
     INFECTED = 2
     RECOVERED = 3
@@ -48,73 +69,250 @@ class MobilityType(Enum):
     LOCAL_ONLY = 2
     BETWEEN_GRIDS = 3
 
+# Stage values frozen as plain ints so the compiled kernel can branch on them
+_SUSCEPTIBLE = Stage.SUSCEPTIBLE.value
+_INFECTED = Stage.INFECTED.value
+_RECOVERED = Stage.RECOVERED.value
+_DECEASED = Stage.DECEASED.value
+
+# Moore offsets, indexed by a single uniform draw during kernel movement
+_OFFSETS = np.array([[-1, -1], [-1, 0], [-1, 1], [0, -1],
+                     [0, 1], [1, -1], [1, 0], [1, 1]], dtype=np.int8)
+
+@njit(parallel=True)
+def _step_kernel(stages, isolated, curr_incubation, curr_recovery, curr_dwelling,
+                 incubation_time, recovery_time, severity_value,
+                 pos_x, pos_y, n_contagious_grid, uniforms, dwell_draws,
+                 rate_inbound, prob_contagion, width, height):
+    """Advances the whole population one step over the SoA state arrays.
+
+    This is the batch fast path: it mirrors ISEpiAgent.step over compiled
+    parallel loops instead of per-object Python dispatch. The per-agent
+    severe outcome folds into DECEASED, the nearest stage in the SIRD
+    strip-down.
+    """
+
+    for i in prange(stages.shape[0]):
+        stage = stages[i]
+
+        if stage == _SUSCEPTIBLE:
+            if uniforms[i, 0] < rate_inbound:
+                stages[i] = _INFECTED
+                continue
+
+            n = n_contagious_grid[pos_x[i], pos_y[i]]
+
+            if n > 0 and uniforms[i, 1] < 1.0 - (1.0 - prob_contagion)**n:
+                stages[i] = _INFECTED
+                continue
+
+            if isolated[i]:
+                continue
+
+            if curr_dwelling[i] > 0:
+                curr_dwelling[i] = curr_dwelling[i] - 1
+            else:
+                k = int(uniforms[i, 3] * 8)
+                pos_x[i] = (pos_x[i] + _OFFSETS[k, 0]) % width
+                pos_y[i] = (pos_y[i] + _OFFSETS[k, 1]) % height
+                curr_dwelling[i] = dwell_draws[i]
+        elif stage == _INFECTED:
+            if curr_incubation[i] + curr_recovery[i] < incubation_time[i] + recovery_time[i]:
+                curr_recovery[i] = curr_recovery[i] + 1
+
+                if uniforms[i, 2] < severity_value[i]:
+                    stages[i] = _DECEASED
+            else:
+                stages[i] = _RECOVERED
+        elif stage == _RECOVERED:
+            curr_recovery[i] = 0
+
+            if curr_dwelling[i] > 0:
+                curr_dwelling[i] = curr_dwelling[i] - 1
+            else:
+                k = int(uniforms[i, 3] * 8)
+                pos_x[i] = (pos_x[i] + _OFFSETS[k, 0]) % width
+                pos_y[i] = (pos_y[i] + _OFFSETS[k, 1]) % height
+                curr_dwelling[i] = dwell_draws[i]
+
+class TrackingMultiGrid(MultiGrid):
+    """A MultiGrid that maintains a direct cell-to-occupants index. Same-cell
+    lookups in the agent hot path become a single dict access instead of a
+    get_cell_list_contents call that allocates a fresh list each time.
+    """
+
+    def __init__(self, width, height, torus):
+        super().__init__(width, height, torus)
+        self._cell_index = defaultdict(list)
+
+        # Moore neighborhoods never change, so the torus wrap-around is
+        # resolved once here and move() reduces to a tuple lookup
+        self._moore = {}
+
+        for x in range(width):
+            for y in range(height):
+                self._moore[(x, y)] = tuple(
+                    ((x + dx) % width, (y + dy) % height)
+                    for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                    if (dx, dy) != (0, 0))
+
+    def place_agent(self, agent, pos):
+        super().place_agent(agent, pos)
+        self._cell_index[pos].append(agent)
+
+    def remove_agent(self, agent):
+        pos = agent.pos
+        super().remove_agent(agent)
+        self._cell_index[pos].remove(agent)
+
+    def move_agent(self, agent, pos):
+        self._cell_index[agent.pos].remove(agent)
+        super().move_agent(agent, pos)
+        self._cell_index[pos].append(agent)
+
 class ISEpiAgent(Agent):
     """ An agent representing a potential covid case"""
-    
+
+    # Fixed slot storage for per-agent state: stage/isolated/employed are
+    # array-backed properties, so only their backing fields appear here
+    __slots__ = ('_idx', '_stage', 'incubation_time', 'dwelling_time',
+                 'recovery_time', 'prob_contagion', 'mortality_value',
+                 'severity_value', 'curr_dwelling', 'curr_incubation',
+                 'curr_recovery', 'astep', 'isolated_but_inefficient',
+                 'locked', 'earmark')
+
+    # Type-stable fields, declared so ahead-of-time compilation can lower
+    # attribute access to direct loads
+    _idx: int
+    _stage: Stage
+    incubation_time: int
+    dwelling_time: int
+    recovery_time: int
+    prob_contagion: float
+    mortality_value: float
+    severity_value: float
+    curr_dwelling: int
+    curr_incubation: int
+    curr_recovery: int
+    astep: int
+    isolated_but_inefficient: bool
+    locked: bool
+    earmark: int
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
+
+        # Position of this agent in the model-level state arrays
+        self._idx = unique_id
         self.stage = Stage.SUSCEPTIBLE
-       
-        # These are fixed values associated with properties of individuals
-        self.incubation_time = poisson.rvs(model.avg_incubation)
-        self.dwelling_time = poisson.rvs(model.avg_dwell)
-        self.recovery_time = poisson.rvs(model.avg_recovery)
+
+        # These are fixed values associated with properties of individuals,
+        # drawn in one batch at model initialization
+        self.incubation_time = int(model._init_incubation[self._idx])
+        self.dwelling_time = int(model._init_dwelling[self._idx])
+        self.recovery_time = int(model._init_recovery[self._idx])
         self.prob_contagion = self.model.prob_contagion
        
         # Mortality in vulnerable population appears to be around day 2-3
         self.mortality_value = self.model.mortality_rate/(self.model.dwell_15_day*self.recovery_time)
         # Severity appears to appear after day 5
         self.severity_value = self.model.prob_severe/(self.model.dwell_15_day*self.recovery_time)
+        self.isolated_but_inefficient = False
         self.curr_dwelling = 0
         self.curr_incubation = 0
         self.curr_recovery = 0
-        
+        self.astep = 0
+        self.locked = False
+
+        # Default partition; the scheduler moves agents via change_earmark
+        self.earmark = 0
+
+    # Stage and mobility state are mirrored into model-level NumPy arrays so
+    # that population counts become vectorized reductions instead of Python
+    # loops over the full schedule
+    @property
+    def stage(self):
+        return self._stage
+
+    @stage.setter
+    def stage(self, value):
+        old = getattr(self, '_stage', None)
+        self._stage = value
+        self.model._stage_arr[self._idx] = value.value
+
+        # Running tallies of the infected compartment, so Rt reporters
+        # never need a full population scan
+        if value == Stage.INFECTED and old != Stage.INFECTED:
+            self.model._infected_count = self.model._infected_count + 1
+            self.model._infected_incubation_sum = self.model._infected_incubation_sum + self.incubation_time
+        elif old == Stage.INFECTED and value != Stage.INFECTED:
+            self.model._infected_count = self.model._infected_count - 1
+            self.model._infected_incubation_sum = self.model._infected_incubation_sum - self.incubation_time
+
+    @property
+    def isolated(self):
+        return bool(self.model._isolated_arr[self._idx])
+
+    @isolated.setter
+    def isolated(self, value):
+        self.model._isolated_arr[self._idx] = value
+
+    @property
+    def employed(self):
+        return bool(self.model._employed_arr[self._idx])
+
+    @employed.setter
+    def employed(self, value):
+        self.model._employed_arr[self._idx] = value
+
     def alive(self):
         print(f'{self.unique_id} {self.age_group} {self.sex_group} is alive')
 
-    def is_contagious(self):
-        return (self.stage == Stage.EXPOSED) or (self.stage == Stage.ASYMPTOMATIC)
+    def is_contagious(self) -> bool:
+        return self.stage == Stage.INFECTED
 
     # In this function, we count effective interactants
-    def interactants(self):
+    def interactants(self) -> int:
         count = 0
 
         if (self.stage != Stage.DECEASED) and (self.stage != Stage.RECOVERED):
-            for agent in self.model.grid.get_cell_list_contents([self.pos]):
+            for agent in self.model.grid._cell_index[self.pos]:
                 if agent.unique_id != self.unique_id:
                     if not(agent.isolated) or self.isolated_but_inefficient:
                         count = count + 1
 
         return count
 
-    def step(self):
+    def step(self) -> None:
+        # Bound once: the interpreter cannot hoist these attribute chains
+        # out of the hot path by itself
+        model = self.model
+        idx = self._idx
+
         # Using the model, determine if a susceptible individual becomes infected due to
         # being elsewhere and returning to the community
         if self.stage == Stage.SUSCEPTIBLE:
-            if bernoulli.rvs(self.model.rate_inbound):
+            if model._u_inbound[idx] < model.rate_inbound:
                 self.stage = Stage.INFECTED
 
         if self.stage == Stage.SUSCEPTIBLE:
             # Important: infected people drive the spread, not
-            # the number of healthy ones
-            cellmates = self.model.grid.get_cell_list_contents([self.pos])
-            infected_contact = False
-
-            # Isolated people should only be contagious if they do not follow proper
-            # shelter-at-home measures
-            for c in cellmates:
-                if c.is_contagious():
+            # the number of healthy ones. The model's precompute pass
+            # already found the contagious occupants of this cell, so
+            # contact tracing and the infection draw share one scan
+            contagious_mates = model._cell_contagious.get(self.pos, ())
+
+            if contagious_mates:
+                # Every contagious cellmate is traced, not just the first
+                for c in contagious_mates:
                     c.add_contact_trace(self)
-                    if self.isolated and bernoulli.rvs(1 - self.model.prob_isolation_effective):
-                        self.isolated_but_inefficient = True
-                        infected_contact = True
-                        break
-                    else:
-                        infected_contact = True
-                        break        
-            
-            if infected_contact:
-                if bernoulli.rvs(self.prob_contagion):
+
+                # Isolated people should only be exposed if they do not follow
+                # proper shelter-at-home measures
+                if self.isolated and model._u_leak[idx] < model._p_leak:
+                    self.isolated_but_inefficient = True
+
+                if model._u_contagion[idx] < 1 - (1 - self.prob_contagion)**len(contagious_mates):
                     self.stage = Stage.INFECTED
 
             # Second opportunity to get infected: residual droplets in places
@@ -126,13 +324,15 @@ class ISEpiAgent(Agent):
             if self.curr_incubation + self.curr_recovery < self.incubation_time + self.recovery_time:
                 self.curr_recovery = self.curr_recovery + 1
 
-                if bernoulli.rvs(self.severity_value):
-                    self.stage = Stage.SEVERE
+                # The severe outcome folds into DECEASED, the nearest stage
+                # in the SIRD strip-down, matching the compiled kernel
+                if model._u_severity[idx] < self.severity_value:
+                    self.stage = Stage.DECEASED
             else:
                 self.stage = Stage.RECOVERED
         elif self.stage == Stage.RECOVERED:
-            cellmates = self.model.grid.get_cell_list_contents([self.pos])
-            
+            cellmates = model.grid._cell_index[self.pos]
+
             # A recovered agent can now move freely within the grid again
             self.curr_recovery = 0
             self.move()
@@ -144,97 +344,52 @@ class ISEpiAgent(Agent):
 
         self.astep = self.astep + 1
 
-    def move(self):
+    def move(self) -> None:
         # If dwelling has not been exhausted, do not move
         if self.curr_dwelling > 0:
             self.curr_dwelling = self.curr_dwelling - 1
 
         # If dwelling has been exhausted, move and replenish the dwell
         else:
-            possible_steps = self.model.grid.get_neighborhood(
-                self.pos,
-                moore=True,
-                include_center=False
-            )
-            new_position = self.random.choice(possible_steps)
+            possible_steps = self.model.grid._moore[self.pos]
+            new_position = possible_steps[self.model.rng.integers(len(possible_steps))]
 
             self.model.grid.move_agent(self, new_position)
-            self.curr_dwelling = poisson.rvs(self.model.avg_dwell)
+            self.curr_dwelling = self.model._next_dwell()
 
 def compute_susceptible(model):
-    return count_type(model, Stage.SUSCEPTIBLE)/model.num_agents
+    return model._metrics_cache['susceptible']/model.num_agents
 
 def compute_infected(model):
-    return count_type(model, Stage.INFECTED)/model.num_agents
+    return model._metrics_cache['infected']/model.num_agents
 
 def compute_recovered(model):
-    return count_type(model, Stage.RECOVERED)/model.num_agents
+    return model._metrics_cache['recovered']/model.num_agents
 
 def compute_deceased(model):
-    return count_type(model, Stage.DECEASED)/model.num_agents
-
-def count_type(model, stage):
-    count = 0
+    return model._metrics_cache['deceased']/model.num_agents
 
-    for agent in model.schedule.agents:
-        if agent.stage == stage:
-            count = count + 1
-
-    return count
+def count_type(model, stage) -> int:
+    return int((model._stage_arr == stage.value).sum())
 
 def compute_isolated(model):
-    count = 0
-
-    for agent in model.schedule.agents:
-        if agent.isolated:
-            count = count + 1
-
-    return count/model.num_agents
+    return model._metrics_cache['isolated']/model.num_agents
 
 def compute_employed(model):
-    count = 0
-
-    for agent in model.schedule.agents:
-        if agent.employed:
-            count = count + 1
-
-    return count/model.num_agents
+    return model._metrics_cache['employed']/model.num_agents
 
 def compute_unemployed(model):
-    count = 0
-
-    for agent in model.schedule.agents:
-        if not(agent.employed):
-            count = count + 1
-
-    return count/model.num_agents
+    return (model.num_agents - model._metrics_cache['employed'])/model.num_agents
 
 def compute_contacts(model):
-    count = 0
-
-    for agent in model.schedule.agents:
-        count = count + agent.interactants()
-
-    return count/len(model.schedule.agents)
+    return model._metrics_cache['contacts']
 
 def compute_stepno(model):
     return model.stepno
 
 def compute_eff_reprod_number(model):
-    prob_contagion = model.prob_contagion
-    infected = 0.0
-    infected_time = 0.0
-
-    for agent in model.schedule.agents:
-        if agent.stage == Stage.INFECTED:
-            infected += 1
-            infected_time = infected_time + agent.incubation_time
-
-        else:
-            continue
-
     avg_contacts = compute_contacts(model)
-    return prob_contagion * avg_contacts * (infected_time/infected)
+    return model.prob_contagion * avg_contacts * (model._infected_incubation_sum/max(model._infected_count, 1))
 
 def compute_num_agents(model):
     return model.num_agents
@@ -262,8 +417,8 @@ class ISEpiModel(Model):
         self.commuters_a = gridworld["city_a"]["commuters"]
         self.commuters_b = gridworld["city_b"]["commuters"]
         
-        self.grid_a = MultiGrid(gridworld["city_a"]["width"], gridworld["city_a"]["height"], True)
-        self.grid_b = MultiGrid(gridworld["city_b"]["width"], gridworld["city_b"]["height"], True)
+        self.grid_a = TrackingMultiGrid(gridworld["city_a"]["width"], gridworld["city_a"]["height"], True)
+        self.grid_b = TrackingMultiGrid(gridworld["city_b"]["width"], gridworld["city_b"]["height"], True)
         
         # Epidemiology-related parameters
         self.avg_incubation = int(round(epidemiology["avg_incubation_time"] * self.dwell_15_day))
@@ -272,6 +427,48 @@ class ISEpiModel(Model):
         self.avg_recovery = epidemiology["avg_recovery_time"] * self.dwell_15_day
         self.num_init = int(self.num_agents * epidemiology["prop_initial_infected"])
         self.mortality_rate = epidemiology["mortality_rate"]
+        self.prob_severe = epidemiology["prob_severe"]
+        self.rate_inbound = epidemiology["rate_inbound"]
+        self.prob_isolation_effective = epidemiology["prob_isolation_effective"]
+
+        # Hoisted once: the complement is what the agent hot path tests
+        self._p_leak = 1 - self.prob_isolation_effective
+
+        # Population state mirrored as NumPy arrays: agents write through their
+        # stage/isolated/employed setters, so each DataCollector tick reduces
+        # over these instead of walking the schedule once per reporter
+        self._stage_arr = np.zeros(self.num_agents, dtype=np.uint8)
+        self._isolated_arr = np.zeros(self.num_agents, dtype=np.bool_)
+        self._employed_arr = np.zeros(self.num_agents, dtype=np.bool_)
+        self._infected_count = 0
+        self._infected_incubation_sum = 0.0
+
+        # Single generator for all stochastic draws. Individual times are
+        # drawn for the whole population at once and sliced per agent, and
+        # dwell replenishments come from a refillable buffer
+        self.rng = np.random.default_rng()
+
+        # Counters and times stay well under 2**16, so uint16 halves the
+        # cache footprint of the step kernel's sequential scans
+        assert self.avg_incubation * 3 < 2**16
+        assert self.avg_recovery * 3 < 2**16
+
+        self._init_incubation = self.rng.poisson(self.avg_incubation, size=self.num_agents).astype(np.uint16)
+        self._init_dwelling = self.rng.poisson(self.avg_dwell, size=self.num_agents).astype(np.uint16)
+        self._init_recovery = self.rng.poisson(self.avg_recovery, size=self.num_agents).astype(np.uint16)
+        self._dwell_buffer = self.rng.poisson(self.avg_dwell, size=self.num_agents)
+        self._dwell_buffer_pos = 0
+        self._draw_step_uniforms()
+
+        # SoA counterpart of the per-agent state, consumed by the compiled
+        # step kernel when the "kernel" scheduler is requested for batch runs
+        self.use_kernel = (scheduler == "kernel") and _HAVE_NUMBA
+        self._curr_incubation_arr = np.zeros(self.num_agents, dtype=np.uint16)
+        self._curr_recovery_arr = np.zeros(self.num_agents, dtype=np.uint16)
+        self._curr_dwelling_arr = np.zeros(self.num_agents, dtype=np.uint16)
+        self._severity_arr = self.prob_severe/(self.dwell_15_day*self._init_recovery)
+        self._pos_x = np.zeros(self.num_agents, dtype=np.int32)
+        self._pos_y = np.zeros(self.num_agents, dtype=np.int32)
 
         # Setup city A
         
@@ -285,13 +482,16 @@ class ISEpiModel(Model):
                 for k in range(num_agents):
                     a = ISEpiAgent(self.i, ag, sg, mort, self)
                     self.schedule.add(a)
-                    x = self.random.randrange(self.grid.width)
-                    y = self.random.randrange(self.grid.height)
+                    x = int(self.rng.integers(self.grid.width))
+                    y = int(self.rng.integers(self.grid.height))
                     self.grid.place_agent(a, (x,y))
                     self.i = self.i + 1
-                    
+
+        for a in self.schedule.agents:
+            self._pos_x[a._idx], self._pos_y[a._idx] = a.pos
+
         # Setup city B
-        
+
         self.datacollector = DataCollector(
             model_reporters = {
                 "Step": compute_stepno,
@@ -316,19 +516,143 @@ class ISEpiModel(Model):
             }
         )
 
-        # Final step: infect an initial proportion of random agents  
+        # Final step: infect an initial proportion of random agents
+        num_init = self.num_init
+
         for a in self.schedule.agents:
-            if self.num_init < 0:
+            if num_init < 0:
                 break
             else:
-                a.stage = Stage.EXPOSED
+                a.stage = Stage.INFECTED
                 num_init = num_init - 1
-   
+
+        self._collect_metrics()
+
+    def _collect_metrics(self):
+        # Every reporter keys into this cache, built once per step, so the
+        # reporter block never re-reduces the arrays or walks the schedule
+        counts = np.bincount(self._stage_arr, minlength=5)
+
+        # Contacts: a cell with m mixing occupants contributes m*(m-1)
+        # ordered pairs. Deceased and recovered occupants do not mix and
+        # are not counted, which also stops dead agents left on the grid
+        # from inflating the metric
+        if self.use_kernel:
+            # The kernel moves agents only in the position arrays and never
+            # touches the grid, so occupancy is reduced from those arrays
+            # with a bincount over flattened cell ids
+            mixing = ((self._stage_arr != Stage.DECEASED.value)
+                      & (self._stage_arr != Stage.RECOVERED.value)
+                      & ~self._isolated_arr)
+            cells = self._pos_x.astype(np.intp)*self.grid.height + self._pos_y
+            occupancy = np.bincount(cells[mixing], minlength=self.grid.width*self.grid.height)
+            contacts = int((occupancy*(occupancy - 1)).sum())
+        else:
+            contacts = 0
+
+            for cell_agents in self.grid._cell_index.values():
+                m = 0
+
+                for a in cell_agents:
+                    if a._stage == Stage.DECEASED or a._stage == Stage.RECOVERED:
+                        continue
+
+                    if not a.isolated or a.isolated_but_inefficient:
+                        m = m + 1
+
+                contacts = contacts + m*(m - 1)
+
+        self._metrics_cache = {
+            'susceptible': int(counts[Stage.SUSCEPTIBLE.value]),
+            'infected': int(counts[Stage.INFECTED.value]),
+            'recovered': int(counts[Stage.RECOVERED.value]),
+            'deceased': int(counts[Stage.DECEASED.value]),
+            'isolated': int(self._isolated_arr.sum()),
+            'employed': int(self._employed_arr.sum()),
+            'contacts': contacts/self.num_agents
+        }
+
+    def _draw_step_uniforms(self):
+        # One batched draw per Bernoulli decision point, consumed by agents
+        # during the upcoming scheduler pass
+        self._u_inbound = self.rng.random(self.num_agents)
+        self._u_contagion = self.rng.random(self.num_agents)
+        self._u_severity = self.rng.random(self.num_agents)
+        self._u_leak = self.rng.random(self.num_agents)
+
+    def _precompute_contagion(self):
+        # One vectorized pass over the population builds the per-cell count
+        # of contagious occupants for the upcoming scheduler pass
+        contagious = self._stage_arr == Stage.INFECTED.value
+
+        if self.use_kernel:
+            pos_x, pos_y = self._pos_x, self._pos_y
+        else:
+            agents = self.schedule.agents
+            pos_arr = np.array([a.pos for a in agents], dtype=np.intp)
+            pos_x, pos_y = pos_arr[:, 0], pos_arr[:, 1]
+
+        counts = np.zeros((self.grid.width, self.grid.height), dtype=np.intp)
+        np.add.at(counts, (pos_x[contagious], pos_y[contagious]), 1)
+        self._n_contagious_grid = counts
+
+        # The same mask yields the contagious occupants per cell, shared by
+        # contact tracing and the infection draw in the per-agent path
+        cell_contagious = defaultdict(list)
+
+        if not self.use_kernel:
+            for i in np.flatnonzero(contagious):
+                cell_contagious[agents[i].pos].append(agents[i])
+
+        self._cell_contagious = cell_contagious
+
+    def _step_soa(self):
+        # Batch fast path: advance the whole population in one kernel call
+        uniforms = self.rng.random((self.num_agents, 4))
+        dwell_draws = self.rng.poisson(self.avg_dwell, size=self.num_agents).astype(np.uint16)
+        _step_kernel(self._stage_arr, self._isolated_arr,
+                     self._curr_incubation_arr, self._curr_recovery_arr,
+                     self._curr_dwelling_arr,
+                     self._init_incubation, self._init_recovery,
+                     self._severity_arr, self._pos_x, self._pos_y,
+                     self._n_contagious_grid, uniforms, dwell_draws,
+                     self.rate_inbound, self.prob_contagion,
+                     self.grid.width, self.grid.height)
+
+        # Keep the scheduler clock moving so batch runners still terminate
+        self.schedule.steps += 1
+        self.schedule.time += 1
+
+    def _next_dwell(self):
+        if self._dwell_buffer_pos >= len(self._dwell_buffer):
+            self._dwell_buffer = self.rng.poisson(self.avg_dwell, size=self.num_agents)
+            self._dwell_buffer_pos = 0
+
+        value = int(self._dwell_buffer[self._dwell_buffer_pos])
+        self._dwell_buffer_pos = self._dwell_buffer_pos + 1
+        return value
+
     def step(self):
+        # One metrics pass per step, shared by every reporter
+        self._collect_metrics()
+
+        # The kernel path transitions stages outside the property setter,
+        # so the infected tallies are refreshed from the arrays instead
+        if self.use_kernel:
+            infected_mask = self._stage_arr == Stage.INFECTED.value
+            self._infected_count = int(infected_mask.sum())
+            self._infected_incubation_sum = float(self._init_incubation[infected_mask].sum())
+
         self.datacollector.collect(self)
-        
+        self._precompute_contagion()
+
         if self.stepno % self.dwell_15_day == 0:
-            print(f'Simulating day {self.stepno // self.dwell_15_day}')
-        
-        self.schedule.step()
+            logger.info("Simulating day %d", self.stepno // self.dwell_15_day)
+
+        if self.use_kernel:
+            self._step_soa()
+        else:
+            self._draw_step_uniforms()
+            self.schedule.step()
+
         self.stepno = self.stepno + 1
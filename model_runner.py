@@ -6,13 +6,19 @@
 
 from batchrunner_local import BatchRunnerMP
 from multiprocessing import freeze_support
+import multiprocessing
 from isepi import ISEpiModel
 from isepi import Stage
 from isepi import MobilityType
-import pandas as pd
 import json
+import logging
 import sys
 
+# Keep workers quiet: per-day progress messages from every process would
+# contend on the same pipe
+logging.basicConfig()
+logging.getLogger().setLevel(logging.WARNING)
+
 num_procs = int(sys.argv[1])
 file_params = sys.argv[2]
 
@@ -39,9 +45,14 @@ num_steps = data["ensemble"]["days"]
 if __name__ == "__main__":
     freeze_support()
 
+    # Fork so large read-only model parameters are inherited copy-on-write
+    # by the workers instead of being pickled into each one
+    multiprocessing.set_start_method('fork', force=True)
+
     batch_run = BatchRunnerMP(
         ISEpiModel,
         nr_processes=num_procs,
+        chunksize=max(1, num_iterations//(num_procs*4)),
         fixed_parameters=model_params,
         variable_parameters=var_params,
         iterations=num_iterations,
@@ -70,22 +81,18 @@ if __name__ == "__main__":
     print(json.dumps(data, indent=3))
     print("")
     print(f"Executing an ensemble of size {num_iterations} using {num_steps} steps with {num_procs} machine cores...")
-    cm_runs = batch_run.run_all()
-
     print("")
-    print("Saving results to file...")
-
-    ldfs = []
-    i = 0
-
-    for cm in cm_runs.values():
-        cm["Iteration"] = i
-        ldfs.append(cm)
-        i = i + 1
+    print("Streaming results to file as runs complete...")
 
     file_out = data["output"]["prefix"]
+    i = 0
 
-    dfs = pd.concat(ldfs)
-    dfs.to_csv(file_out + ".csv")
+    # Each run is appended as soon as it finishes, so peak memory stays at
+    # one run's worth of data instead of the whole ensemble
+    with open(file_out + ".csv", "w") as fh:
+        for params, cm in batch_run.run_iter():
+            cm["Iteration"] = i
+            cm.to_csv(fh, header=(i == 0))
+            i = i + 1
 
     print("Simulation completed without errors.")